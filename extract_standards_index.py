@@ -4,45 +4,54 @@ Extract id, title, keywords, and aliases from all standards JSON files
 and combine them into a single index file.
 """
 
-import json
+import os
+import shutil
+import tempfile
 from pathlib import Path
 
+from src.json_utils import dumps, loads
+
+INDEX_FIELDS = {"id": "", "title": "", "keywords": [], "aliases": []}
+
+
+def read_index_fields(json_file: Path) -> dict:
+    with open(json_file, 'rb') as f:
+        data = loads(f.read())
+    return {key: data.get(key, default) for key, default in INDEX_FIELDS.items()}
+
+
 def extract_standards_index():
     json_dir = Path("json_standards")
     output_file = Path("standards_index.json")
     
-    standards_list = []
-    
     json_files = sorted(json_dir.glob("*.json"))
+    total_standards = 0
     
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            standard_entry = {
-                "id": data.get("id", ""),
-                "title": data.get("title", ""),
-                "keywords": data.get("keywords", []),
-                "aliases": data.get("aliases", [])
-            }
+    # Entries are streamed to a scratch file as they are read; the header with
+    # the total is written once the count is known, then the body is copied in.
+    with tempfile.TemporaryFile() as body:
+        for json_file in json_files:
+            try:
+                standard_entry = read_index_fields(json_file)
+            except Exception as e:
+                print(f"✗ Error reading {json_file.name}: {e}")
+                continue
             
-            standards_list.append(standard_entry)
+            body.write(b",\n    " if total_standards else b"\n    ")
+            body.write(dumps(standard_entry).replace(b"\n", b"\n    "))
+            total_standards += 1
             print(f"✓ Extracted: {standard_entry['id']} - {standard_entry['title'][:50]}...")
-            
-        except Exception as e:
-            print(f"✗ Error reading {json_file.name}: {e}")
-    
-    output_data = {
-        "total_standards": len(standards_list),
-        "standards": standards_list
-    }
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, ensure_ascii=False, indent=2)
+        
+        tmp_file = output_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'wb') as out:
+            out.write(b'{\n  "total_standards": %d,\n  "standards": [' % total_standards)
+            body.seek(0)
+            shutil.copyfileobj(body, out)
+            out.write(b"\n  ]\n}" if total_standards else b"]\n}")
+        os.replace(tmp_file, output_file)
     
-    print(f"\n✓ تم حفظ {len(standards_list)} معيار في {output_file}")
-    print(f"  Saved {len(standards_list)} standards to {output_file}")
+    print(f"\n✓ تم حفظ {total_standards} معيار في {output_file}")
+    print(f"  Saved {total_standards} standards to {output_file}")
 
 if __name__ == "__main__":
     extract_standards_index()
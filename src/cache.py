@@ -0,0 +1,65 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from src.config import GEMINI_CACHE_DIR, GEMINI_CACHE_MAX_ENTRIES, GEMINI_MODEL
+from src.json_utils import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def hash_pdf(pdf_path: Path) -> str:
+    with open(pdf_path, "rb") as f:
+        return hashlib.file_digest(f, "blake2b").hexdigest()
+
+
+def get_cache_path(pdf_path: Path) -> Optional[Path]:
+    """Return the cache entry path for this PDF's bytes, or None if it can't be hashed."""
+    try:
+        digest = hash_pdf(pdf_path)
+    except OSError as e:
+        logger.warning(f"Could not hash {pdf_path.name}, skipping extraction cache: {e}")
+        return None
+    return GEMINI_CACHE_DIR / f"{GEMINI_MODEL}-{digest}.json"
+
+
+def prune_cache() -> None:
+    """Drop the least recently used entries beyond GEMINI_CACHE_MAX_ENTRIES."""
+    entries = []
+    for path in GEMINI_CACHE_DIR.glob("*.json"):
+        # Another worker may prune the same entry between glob and stat.
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    entries.sort()
+    for _, path in entries[:max(0, len(entries) - GEMINI_CACHE_MAX_ENTRIES)]:
+        path.unlink(missing_ok=True)
+
+
+def load_cached_extraction(cache_path: Path) -> Optional[dict]:
+    try:
+        result = loads(cache_path.read_bytes())
+        os.utime(cache_path)
+        return result
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable cache entry {cache_path}: {e}")
+        return None
+
+
+def save_cached_extraction(cache_path: Path, result: dict) -> None:
+    """Store an extraction that has already passed validation, then prune old entries."""
+    try:
+        cache_path.write_bytes(dumps(result))
+    except Exception as e:
+        logger.warning(f"Could not write cache entry {cache_path}: {e}")
+        return
+    
+    try:
+        prune_cache()
+    except Exception as e:
+        logger.warning(f"Could not prune cache {GEMINI_CACHE_DIR}: {e}")
@@ -0,0 +1,418 @@
+"""
+AAOIFI Standards PDF to JSON Processor
+Processes 61 Sharia standards from PDF to MongoDB-ready JSON format.
+Uses Google Gemini 2.5 Flash for accurate text extraction.
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import signal
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Optional, Tuple, Set
+
+from src.config import (
+    PDF_INPUT_DIR,
+    JSON_OUTPUT_DIR,
+    LOGS_DIR,
+    TOTAL_STANDARDS,
+    GEMINI_API_KEY,
+    PROGRESS_FILE,
+    PROGRESS_FLUSH_EVERY,
+    PROGRESS_FLUSH_INTERVAL_SECONDS,
+    MAX_CONCURRENT_REQUESTS,
+    MAX_INLINE_SIZE_MB,
+)
+from src.cache import get_cache_path, load_cached_extraction, save_cached_extraction
+from src.pdf_processor import bytes_to_mb, process_pdf_with_gemini, upload_file_to_gemini
+from src.fast_normalize import convert_hindi_to_arabic_numerals
+from src.json_utils import loads
+from src.json_builder import (
+    build_standard_json,
+    format_standard_id,
+    save_standard_json,
+    validate_json_for_mongodb,
+)
+
+logger = logging.getLogger(__name__)
+
+STATUS_PROCESSED = "processed"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+
+_tracked_standards: Set[int] = set()
+_flushed_count = 0
+_last_flush_ts = time.monotonic()
+
+
+def load_progress() -> Set[int]:
+    """Load the set of successfully processed standard numbers."""
+    if PROGRESS_FILE.exists():
+        try:
+            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+                return set(data.get('completed_standards', []))
+        except (json.JSONDecodeError, Exception) as e:
+            logger.warning(f"Could not load progress file: {e}")
+    return set()
+
+
+def save_progress(completed_standards: Set[int]) -> None:
+    """Atomically save the set of successfully processed standard numbers."""
+    global _flushed_count, _last_flush_ts
+    try:
+        data = {
+            'completed_standards': sorted(list(completed_standards)),
+            'last_updated': datetime.now().isoformat(),
+            'total_completed': len(completed_standards)
+        }
+        tmp_file = PROGRESS_FILE.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, PROGRESS_FILE)
+        _flushed_count = len(completed_standards)
+        _last_flush_ts = time.monotonic()
+        logger.info(f"Progress saved: {len(completed_standards)} standards completed")
+    except Exception as e:
+        logger.error(f"Could not save progress: {e}")
+
+
+def track_progress(completed_standards: Set[int]) -> None:
+    """Start batching progress writes for the given set of completed standards."""
+    global _tracked_standards, _flushed_count, _last_flush_ts
+    _tracked_standards = completed_standards
+    _flushed_count = len(completed_standards)
+    _last_flush_ts = time.monotonic()
+
+
+def record_progress(standard_number: int) -> None:
+    """Mark a standard as completed, writing the progress file in batches."""
+    _tracked_standards.add(standard_number)
+    if (
+        len(_tracked_standards) - _flushed_count >= PROGRESS_FLUSH_EVERY
+        or time.monotonic() - _last_flush_ts > PROGRESS_FLUSH_INTERVAL_SECONDS
+    ):
+        save_progress(_tracked_standards)
+
+
+def flush_progress() -> None:
+    """Write any completed standards not yet saved to the progress file."""
+    if len(_tracked_standards) != _flushed_count:
+        save_progress(_tracked_standards)
+
+
+def _handle_termination(signum, frame) -> None:
+    # Raising SystemExit unwinds the event loop and runs the atexit flush.
+    sys.exit(128 + signum)
+
+
+def setup_logging() -> Path:
+    """Log through a queue so file and console writes happen on a background thread."""
+    log_filename = LOGS_DIR / f"processing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    
+    file_handler = logging.FileHandler(log_filename, encoding="utf-8")
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return log_filename
+
+
+# Tried in priority order; the first pattern found anywhere in the name wins.
+_STANDARD_NUMBER_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"معيار\s*\((\d+)\)",
+    r"معيار[–\-](\d+)",
+    r"المعيار[–\-]الشرعي[–\-]رقم[–\-](\d+)",
+    r"\((\d+)\)",
+    r"رقم[–\-](\d+)",
+    r"(\d+)",
+))
+
+
+@lru_cache(maxsize=None)
+def extract_standard_number(filename: str) -> int:
+    normalized = convert_hindi_to_arabic_numerals(filename)
+    
+    for pattern in _STANDARD_NUMBER_PATTERNS:
+        match = pattern.search(normalized)
+        if match:
+            return int(match.group(1))
+    
+    return 0
+
+
+def get_pdf_files() -> List[Tuple[int, Path, int]]:
+    """List input PDFs as (standard_number, path, size_bytes), sorted by standard number."""
+    pdf_files: List[Tuple[int, Path, int]] = []
+    with os.scandir(PDF_INPUT_DIR) as entries:
+        for entry in entries:
+            stem, suffix = os.path.splitext(entry.name)
+            if suffix.lower() == ".pdf" and entry.is_file():
+                pdf_files.append(
+                    (extract_standard_number(stem), Path(entry.path), entry.stat().st_size)
+                )
+    pdf_files.sort(key=itemgetter(0))
+    
+    return pdf_files
+
+
+def load_existing_output(standard_number: int) -> Optional[Path]:
+    """Return the output path if a valid JSON for this standard was already written."""
+    output_path = JSON_OUTPUT_DIR / f"{format_standard_id(standard_number)}.json"
+    try:
+        if output_path.stat().st_size == 0:
+            return None
+        if validate_json_for_mongodb(loads(output_path.read_bytes())):
+            return output_path
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable output {output_path}: {e}")
+    return None
+
+
+async def process_single_pdf(
+    standard_number: int,
+    pdf_path: Path,
+    size_bytes: int,
+    semaphore: Optional[asyncio.Semaphore] = None
+) -> Tuple[str, str, int]:
+    pdf_name = pdf_path.name
+    
+    if standard_number == 0:
+        return STATUS_FAILED, f"Could not extract standard number from: {pdf_name}", 0
+    
+    existing_output = load_existing_output(standard_number)
+    if existing_output:
+        logger.info(f"Output already exists for standard {standard_number}, skipping: {existing_output}")
+        return STATUS_SKIPPED, str(existing_output), standard_number
+    
+    logger.info(f"Processing standard {standard_number}: {pdf_name}")
+    
+    cache_path = await asyncio.to_thread(get_cache_path, pdf_path)
+    extracted_data = None
+    if cache_path:
+        extracted_data = await asyncio.to_thread(load_cached_extraction, cache_path)
+    from_cache = extracted_data is not None
+    if from_cache:
+        logger.info(f"Using cached extraction for {pdf_name}: {cache_path.name}")
+    else:
+        # Large files go through the Files API. Uploading before taking a
+        # slot lets the upload overlap with other standards' generation.
+        uploaded_file = None
+        if bytes_to_mb(size_bytes) > MAX_INLINE_SIZE_MB:
+            uploaded_file = await upload_file_to_gemini(pdf_path)
+        async with semaphore or nullcontext():
+            extracted_data = await process_pdf_with_gemini(
+                pdf_path, standard_number, uploaded_file, size_bytes
+            )
+    
+    if not extracted_data:
+        return STATUS_FAILED, f"Failed to extract data from: {pdf_name}", standard_number
+    
+    try:
+        standard_json = build_standard_json(standard_number, extracted_data)
+    except (TypeError, ValueError, AttributeError) as e:
+        logger.warning(f"Could not build JSON for standard {standard_number}: {e}")
+        standard_json = None
+    
+    if not standard_json or not validate_json_for_mongodb(standard_json):
+        if from_cache:
+            cache_path.unlink(missing_ok=True)
+        return STATUS_FAILED, f"Invalid JSON structure for: {pdf_name}", standard_number
+    
+    # Only results that passed validation are cached, so a bad response is
+    # retried against Gemini on the next run.
+    if cache_path and not from_cache:
+        await asyncio.to_thread(save_cached_extraction, cache_path, extracted_data)
+    
+    output_path = save_standard_json(standard_number, standard_json)
+    
+    if not output_path:
+        return STATUS_FAILED, f"Failed to save JSON for: {pdf_name}", standard_number
+    
+    return STATUS_PROCESSED, str(output_path), standard_number
+
+
+async def process_pending_pdfs(
+    pdf_files: List[Tuple[int, Path, int]],
+    resume: bool = True
+) -> List[Tuple[str, str, int]]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    progress_lock = asyncio.Lock()
+    
+    async def process_one(
+        standard_number: int,
+        pdf_path: Path,
+        size_bytes: int
+    ) -> Tuple[str, str, int]:
+        status, message, standard_num = await process_single_pdf(
+            standard_number, pdf_path, size_bytes, semaphore
+        )
+        
+        if status == STATUS_PROCESSED:
+            if resume:
+                async with progress_lock:
+                    record_progress(standard_num)
+            logger.info(f"Successfully processed standard {standard_num}")
+        elif status == STATUS_FAILED:
+            logger.error(f"Failed to process: {message}")
+        
+        return status, message, standard_num
+    
+    return await asyncio.gather(
+        *(process_one(*pdf_file) for pdf_file in pdf_files)
+    )
+
+
+def print_summary(
+    total: int,
+    successful: List[int],
+    failed: List[Tuple[int, str]],
+    output_dir: Path
+) -> None:
+    print("\n" + "=" * 60)
+    print("ملخص المعالجة - Processing Summary")
+    print("=" * 60)
+    print(f"إجمالي الملفات المعالجة: {total}")
+    print(f"الملفات الناجحة: {len(successful)}")
+    print(f"الملفات الفاشلة: {len(failed)}")
+    print(f"مجلد الإخراج: {output_dir.absolute()}")
+    print("=" * 60)
+    
+    if successful:
+        print("\nالمعايير المعالجة بنجاح:")
+        for num in sorted(successful):
+            print(f"  - SS{num:02d}")
+    
+    if failed:
+        print("\nالمعايير الفاشلة:")
+        for num, reason in failed:
+            if num > 0:
+                print(f"  - SS{num:02d}: {reason}")
+            else:
+                print(f"  - {reason}")
+    
+    print("\n" + "=" * 60)
+
+
+def run(resume: bool = True) -> None:
+    """Process all pending PDFs; with resume, skip and record standards via the progress file."""
+    log_filename = setup_logging()
+    
+    logger.info("Starting AAOIFI Standards PDF to JSON Processor")
+    logger.info(f"PDF Input Directory: {PDF_INPUT_DIR.absolute()}")
+    logger.info(f"JSON Output Directory: {JSON_OUTPUT_DIR.absolute()}")
+    
+    if not GEMINI_API_KEY:
+        print("\n" + "=" * 60)
+        print("تحذير: مفتاح GEMINI_API_KEY غير موجود!")
+        print("Warning: GEMINI_API_KEY is not set!")
+        print("Please add GEMINI_API_KEY to your environment secrets.")
+        print("=" * 60)
+        logger.warning("GEMINI_API_KEY is not configured. Processing cannot continue.")
+        return
+    
+    pdf_files = get_pdf_files()
+    
+    if not pdf_files:
+        print("\n" + "=" * 60)
+        print("لا توجد ملفات PDF في المجلد!")
+        print("No PDF files found in the input directory!")
+        print(f"Please add PDF files to: {PDF_INPUT_DIR.absolute()}")
+        print("=" * 60)
+        print("\nExpected file naming format:")
+        print("  معيار (1) المتاجرة في العملات.pdf")
+        print("  معيار (2) ....pdf")
+        print("  ...")
+        print("  معيار (61) ....pdf")
+        print("=" * 60)
+        return
+    
+    logger.info(f"Found {len(pdf_files)} PDF files to process")
+    
+    completed_standards = load_progress() if resume else set()
+    if completed_standards:
+        logger.info(f"Resuming from previous session: {len(completed_standards)} standards already completed")
+        print(f"\n✓ استكمال من الجلسة السابقة: {len(completed_standards)} معايير تمت معالجتها مسبقاً")
+        print(f"  Resuming: {len(completed_standards)} standards already processed")
+    
+    successful: List[int] = list(completed_standards)
+    failed: List[Tuple[int, str]] = []
+    skipped_count = 0
+    newly_processed = 0
+    
+    pending_files: List[Tuple[int, Path, int]] = []
+    for standard_number, pdf_path, size_bytes in pdf_files:
+        if standard_number in completed_standards:
+            logger.info(f"Skipping already processed standard {standard_number}: {pdf_path.name}")
+            skipped_count += 1
+            continue
+        
+        pending_files.append((standard_number, pdf_path, size_bytes))
+    
+    if resume:
+        track_progress(completed_standards)
+        atexit.register(flush_progress)
+        signal.signal(signal.SIGTERM, _handle_termination)
+    
+    results = asyncio.run(process_pending_pdfs(pending_files, resume))
+    
+    if resume:
+        flush_progress()
+    
+    for status, message, standard_num in results:
+        if status == STATUS_PROCESSED:
+            successful.append(standard_num)
+            newly_processed += 1
+        elif status == STATUS_SKIPPED:
+            successful.append(standard_num)
+            skipped_count += 1
+        else:
+            failed.append((standard_num, message))
+    
+    if skipped_count > 0:
+        print(f"\n→ تم تخطي {skipped_count} معيار (معالجة سابقة)")
+        print(f"  Skipped {skipped_count} previously processed standards")
+    if newly_processed > 0:
+        print(f"→ تم معالجة {newly_processed} معيار جديد في هذه الجلسة")
+        print(f"  Processed {newly_processed} new standards in this session")
+    
+    print_summary(len(pdf_files), successful, failed, JSON_OUTPUT_DIR)
+    
+    logger.info("Processing completed")
+    logger.info(f"Log file saved to: {log_filename}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Process AAOIFI standards PDFs into JSON.")
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="skip standards recorded in the progress file and record new ones (default: on)",
+    )
+    args = parser.parse_args(argv)
+    run(resume=args.resume)
+
@@ -5,10 +5,15 @@ PDF_INPUT_DIR = Path("AAOIFI_Standards_Complete")
 JSON_OUTPUT_DIR = Path("json_standards")
 LOGS_DIR = Path("logs")
 PROGRESS_FILE = Path("processing_progress.json")
+PROGRESS_FLUSH_EVERY = 5
+PROGRESS_FLUSH_INTERVAL_SECONDS = 10
+GEMINI_CACHE_DIR = Path(".gemini_cache")
+GEMINI_CACHE_MAX_ENTRIES = 128
 
 PDF_INPUT_DIR.mkdir(exist_ok=True)
 JSON_OUTPUT_DIR.mkdir(exist_ok=True)
 LOGS_DIR.mkdir(exist_ok=True)
+GEMINI_CACHE_DIR.mkdir(exist_ok=True)
 
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-2.5-flash"
@@ -16,6 +21,12 @@ GEMINI_MODEL = "gemini-2.5-flash"
 MAX_INLINE_SIZE_MB = 10
 MAX_RETRIES = 3
 RETRY_DELAY_SECONDS = 5
+MAX_CONCURRENT_REQUESTS = 8
+
+GEMINI_RPM = int(os.environ.get("GEMINI_RPM", "1000"))
+GEMINI_TPM = int(os.environ.get("GEMINI_TPM", "1000000"))
+ESTIMATED_TOKENS_PER_REQUEST = 50000
+TARGET_LATENCY_SECONDS = 120
 
 STANDARD_ID_PREFIX = "SS"
 TOTAL_STANDARDS = 61
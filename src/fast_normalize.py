@@ -0,0 +1,48 @@
+from typing import Callable, Optional
+
+# Below this length the encode/decode round-trip costs more than translate().
+NUMBA_MIN_LENGTH = 64_000
+
+HINDI_TO_ARABIC_NUMERALS = str.maketrans({
+    '٠': '0', '١': '1', '٢': '2', '٣': '3', '٤': '4',
+    '٥': '5', '٦': '6', '٧': '7', '٨': '8', '٩': '9'
+})
+
+# numpy/numba are imported on first use of the large-text path, so callers
+# that only normalize short strings (filenames) never pay for the import.
+_normalize_u32: Optional[Callable] = None
+_numba_available = True
+
+
+def _get_kernel() -> Optional[Callable]:
+    global _normalize_u32, _numba_available
+    if _normalize_u32 is None and _numba_available:
+        try:
+            from numba import njit, prange
+        except ImportError:
+            _numba_available = False
+            return None
+        
+        @njit(cache=True, parallel=True)
+        def _normalize_u32(codepoints):
+            for i in prange(codepoints.size):
+                c = codepoints[i]
+                if 0x660 <= c <= 0x669:
+                    codepoints[i] = c - 0x660 + 0x30
+    
+    return _normalize_u32
+
+
+def convert_hindi_to_arabic_numerals(text: str) -> str:
+    if len(text) < NUMBA_MIN_LENGTH:
+        return text.translate(HINDI_TO_ARABIC_NUMERALS)
+    
+    kernel = _get_kernel()
+    if kernel is None:
+        return text.translate(HINDI_TO_ARABIC_NUMERALS)
+    
+    import numpy as np
+    
+    buffer = bytearray(text.encode("utf-32-le"))
+    kernel(np.frombuffer(buffer, dtype=np.uint32))
+    return buffer.decode("utf-32-le")
@@ -1,12 +1,30 @@
-import json
 import logging
 from pathlib import Path
 from typing import Optional
 
 from src.config import JSON_OUTPUT_DIR, STANDARD_ID_PREFIX
+from src.json_utils import dumps
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
 
 logger = logging.getLogger(__name__)
 
+SECTION_DEFAULTS = {"sec_id": "", "heading": "", "text": ""}
+
+STANDARD_SCHEMA = {
+    "type": "object",
+    "required": ["id", "title", "text", "sections", "keywords", "aliases", "pages"],
+    "properties": {
+        "sections": {"type": "array"},
+        "keywords": {"type": "array"},
+        "aliases": {"type": "array"},
+        "pages": {"type": "array"},
+    },
+}
+
 
 def format_standard_id(number: int) -> str:
     return f"{STANDARD_ID_PREFIX}{number:02d}"
@@ -22,20 +40,12 @@ def build_standard_json(
         "id": standard_id,
         "title": extracted_data.get("title", ""),
         "text": extracted_data.get("text", ""),
-        "sections": extracted_data.get("sections", []),
+        "sections": [SECTION_DEFAULTS | section for section in extracted_data.get("sections", [])],
         "keywords": extracted_data.get("keywords", []),
         "aliases": extracted_data.get("aliases", []),
         "pages": extracted_data.get("pages", []),
     }
     
-    for section in standard_json["sections"]:
-        if "sec_id" not in section:
-            section["sec_id"] = ""
-        if "heading" not in section:
-            section["heading"] = ""
-        if "text" not in section:
-            section["text"] = ""
-    
     return standard_json
 
 
@@ -44,8 +54,8 @@ def save_standard_json(standard_number: int, data: dict) -> Optional[Path]:
         standard_id = format_standard_id(standard_number)
         output_path = JSON_OUTPUT_DIR / f"{standard_id}.json"
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(output_path, "wb") as f:
+            f.write(dumps(data))
         
         logger.info(f"Saved JSON: {output_path}")
         return output_path
@@ -54,28 +64,28 @@ def save_standard_json(standard_number: int, data: dict) -> Optional[Path]:
         return None
 
 
-def validate_json_for_mongodb(data: dict) -> bool:
-    required_fields = ["id", "title", "text", "sections", "keywords", "aliases", "pages"]
-    
-    for field in required_fields:
+def _validate_standard_fallback(data: dict) -> None:
+    for field in STANDARD_SCHEMA["required"]:
         if field not in data:
-            logger.warning(f"Missing required field: {field}")
-            return False
-    
-    if not isinstance(data["sections"], list):
-        logger.warning("sections must be a list")
-        return False
-    
-    if not isinstance(data["keywords"], list):
-        logger.warning("keywords must be a list")
-        return False
+            raise ValueError(f"Missing required field: {field}")
     
-    if not isinstance(data["aliases"], list):
-        logger.warning("aliases must be a list")
-        return False
-    
-    if not isinstance(data["pages"], list):
-        logger.warning("pages must be a list")
+    for field in STANDARD_SCHEMA["properties"]:
+        if not isinstance(data[field], list):
+            raise ValueError(f"{field} must be a list")
+
+
+if fastjsonschema is not None:
+    _validate_standard = fastjsonschema.compile(STANDARD_SCHEMA)
+    _ValidationError = fastjsonschema.JsonSchemaException
+else:
+    _validate_standard = _validate_standard_fallback
+    _ValidationError = ValueError
+
+
+def validate_json_for_mongodb(data: dict) -> bool:
+    try:
+        _validate_standard(data)
+        return True
+    except _ValidationError as e:
+        logger.warning(str(e))
         return False
-    
-    return True
@@ -1,11 +1,12 @@
-import os
-import time
+import asyncio
 import logging
+import re
+import time
 from pathlib import Path
 from typing import Optional
 
 from google import genai
-from google.genai import types
+from google.genai import errors, types
 
 from src.config import (
     GEMINI_API_KEY,
@@ -13,11 +14,23 @@ from src.config import (
     MAX_INLINE_SIZE_MB,
     MAX_RETRIES,
     RETRY_DELAY_SECONDS,
+    MAX_CONCURRENT_REQUESTS,
+    GEMINI_RPM,
+    GEMINI_TPM,
+    ESTIMATED_TOKENS_PER_REQUEST,
+    TARGET_LATENCY_SECONDS,
 )
+from src.json_utils import loads
+from src.ratelimit import AIMDController, SlidingWindow
 
 logger = logging.getLogger(__name__)
 
 client = None
+rate_limiter = SlidingWindow(rpm=GEMINI_RPM, tpm=GEMINI_TPM)
+concurrency = AIMDController(c_min=1, c_max=MAX_CONCURRENT_REQUESTS, alpha=0.5, beta=0.5)
+
+THROTTLING_CODES = {429, 503}
+THROTTLING_STATUSES = {"RESOURCE_EXHAUSTED", "UNAVAILABLE"}
 
 def get_client():
     global client
@@ -28,20 +41,53 @@ def get_client():
     return client
 
 
+def is_throttling_error(error: Exception) -> bool:
+    if isinstance(error, errors.APIError):
+        return error.code in THROTTLING_CODES or error.status in THROTTLING_STATUSES
+    return "RESOURCE_EXHAUSTED" in str(error)
+
+
+def get_retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers:
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+    
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for detail in details.get("error", {}).get("details", []):
+            if detail.get("@type", "").endswith("RetryInfo"):
+                match = re.match(r"([\d.]+)s", detail.get("retryDelay", ""))
+                if match:
+                    return float(match.group(1))
+    return None
+
+
+def bytes_to_mb(size_bytes: int) -> float:
+    return size_bytes / (1024 * 1024)
+
+
 def get_file_size_mb(file_path: Path) -> float:
-    return file_path.stat().st_size / (1024 * 1024)
+    return bytes_to_mb(file_path.stat().st_size)
 
 
-def upload_file_to_gemini(file_path: Path) -> Optional[types.File]:
+async def upload_file_to_gemini(file_path: Path) -> Optional[types.File]:
     try:
         api_client = get_client()
         logger.info(f"Uploading file to Gemini Files API: {file_path.name}")
-        uploaded_file = api_client.files.upload(file=str(file_path))
+        uploaded_file = await api_client.aio.files.upload(file=str(file_path))
         
+        poll_count = 0
         while uploaded_file.state == "PROCESSING":
-            time.sleep(2)
+            await asyncio.sleep(min(2.0, 0.2 * 2 ** poll_count))
+            poll_count += 1
             if uploaded_file.name:
-                uploaded_file = api_client.files.get(name=uploaded_file.name)
+                uploaded_file = await api_client.aio.files.get(name=uploaded_file.name)
         
         if uploaded_file.state == "FAILED":
             logger.error(f"File upload failed: {file_path.name}")
@@ -54,7 +100,12 @@ def upload_file_to_gemini(file_path: Path) -> Optional[types.File]:
         return None
 
 
-def process_pdf_with_gemini(pdf_path: Path, standard_number: int) -> Optional[dict]:
+async def process_pdf_with_gemini(
+    pdf_path: Path,
+    standard_number: int,
+    uploaded_file: Optional[types.File] = None,
+    size_bytes: Optional[int] = None,
+) -> Optional[dict]:
     extraction_prompt = f"""أنت خبير في استخراج وتحليل النصوص من مستندات PDF باللغة العربية.
 
 المهمة: استخرج محتوى هذا المعيار الشرعي (معيار رقم {standard_number}) من AAOIFI بدقة كاملة 100%.
@@ -88,62 +139,90 @@ def process_pdf_with_gemini(pdf_path: Path, standard_number: int) -> Optional[di
 
 استخرج المحتوى بدقة مع الحفاظ على جميع الجداول والتنسيقات."""
 
-    file_size_mb = get_file_size_mb(pdf_path)
+    pdf_name = pdf_path.name
+    if size_bytes is not None:
+        file_size_mb = bytes_to_mb(size_bytes)
+    else:
+        file_size_mb = get_file_size_mb(pdf_path)
     
     for attempt in range(MAX_RETRIES):
+        pdf_part = None
+        retry_after = None
+        window_entry = None
+        usage = None
         try:
             api_client = get_client()
             
             if file_size_mb > MAX_INLINE_SIZE_MB:
-                uploaded_file = upload_file_to_gemini(pdf_path)
+                if not uploaded_file or not uploaded_file.uri:
+                    uploaded_file = await upload_file_to_gemini(pdf_path)
                 if not uploaded_file or not uploaded_file.uri:
                     raise Exception("Failed to upload file to Gemini")
                 
-                response = api_client.models.generate_content(
-                    model=GEMINI_MODEL,
-                    contents=[
-                        types.Part.from_uri(
-                            file_uri=uploaded_file.uri,
-                            mime_type="application/pdf",
-                        ),
-                        extraction_prompt,
-                    ],
-                    config=types.GenerateContentConfig(
-                        response_mime_type="application/json",
-                    ),
+                pdf_part = types.Part.from_uri(
+                    file_uri=uploaded_file.uri,
+                    mime_type="application/pdf",
                 )
-            else:
-                with open(pdf_path, "rb") as f:
-                    pdf_bytes = f.read()
+            
+            window_entry = await rate_limiter.wait_if_throttled(ESTIMATED_TOKENS_PER_REQUEST)
+            response_buffer = bytearray()
+            async with concurrency.slot():
+                # Inline PDFs are read only once a slot is free, so at most one
+                # copy per in-flight request is resident.
+                if pdf_part is None:
+                    pdf_part = types.Part.from_bytes(
+                        data=await asyncio.to_thread(pdf_path.read_bytes),
+                        mime_type="application/pdf",
+                    )
                 
-                response = api_client.models.generate_content(
+                started = time.monotonic()
+                stream = await api_client.aio.models.generate_content_stream(
                     model=GEMINI_MODEL,
-                    contents=[
-                        types.Part.from_bytes(
-                            data=pdf_bytes,
-                            mime_type="application/pdf",
-                        ),
-                        extraction_prompt,
-                    ],
+                    contents=[pdf_part, extraction_prompt],
                     config=types.GenerateContentConfig(
                         response_mime_type="application/json",
                     ),
                 )
+                async for chunk in stream:
+                    if chunk.text:
+                        response_buffer += chunk.text.encode("utf-8")
+                    if chunk.usage_metadata:
+                        usage = chunk.usage_metadata
+                latency = time.monotonic() - started
+                pdf_part = None
+            
+            # Without usage_metadata the real count is unknown; the server did
+            # bill the request, so the conservative estimate stays reserved.
+            if usage and usage.total_token_count:
+                rate_limiter.record_usage(window_entry, usage.total_token_count)
+            if latency <= TARGET_LATENCY_SECONDS:
+                await concurrency.on_success()
             
-            if response.text:
-                import json
-                result = json.loads(response.text)
-                logger.info(f"Successfully processed: {pdf_path.name}")
+            if response_buffer:
+                result = loads(response_buffer)
+                logger.info(f"Successfully processed: {pdf_name}")
                 return result
             else:
                 raise Exception("Empty response from Gemini")
                 
         except Exception as e:
-            logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {pdf_path.name}: {e}")
-            if attempt < MAX_RETRIES - 1:
-                time.sleep(RETRY_DELAY_SECONDS * (attempt + 1))
-            else:
-                logger.error(f"All attempts failed for {pdf_path.name}")
+            logger.warning(f"Attempt {attempt + 1}/{MAX_RETRIES} failed for {pdf_name}: {e}")
+            # A rejected or aborted attempt was not billed; release its
+            # reservation so the TPM window doesn't stall later requests.
+            if window_entry is not None and not (usage and usage.total_token_count):
+                rate_limiter.record_usage(window_entry, 0)
+            if is_throttling_error(e):
+                await concurrency.on_error()
+                retry_after = get_retry_after_seconds(e)
+            if attempt == MAX_RETRIES - 1:
+                logger.error(f"All attempts failed for {pdf_name}")
                 return None
+        
+        # Sleep outside the except block so the failed attempt's traceback and
+        # PDF payload are released while waiting.
+        pdf_part = None
+        if retry_after is None:
+            retry_after = RETRY_DELAY_SECONDS * (attempt + 1)
+        await asyncio.sleep(retry_after)
     
     return None
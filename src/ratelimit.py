@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, List, Optional
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60.0
+
+
+class SlidingWindow:
+    """Tracks requests and tokens sent over the last minute against RPM/TPM quotas."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = rpm
+        self.tpm = tpm
+        self._entries: Deque[List[float]] = deque()
+        self._lock = asyncio.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._entries and now - self._entries[0][0] >= WINDOW_SECONDS:
+            self._entries.popleft()
+
+    def _tokens_in_window(self) -> float:
+        return sum(entry[1] for entry in self._entries)
+
+    def _wait_time(self, now: float, tokens: int) -> float:
+        if not self._entries:
+            return 0.0
+        if len(self._entries) >= self.rpm:
+            return WINDOW_SECONDS - (now - self._entries[0][0])
+        used = self._tokens_in_window()
+        if used + tokens <= self.tpm:
+            return 0.0
+        for timestamp, entry_tokens in self._entries:
+            used -= entry_tokens
+            if used + tokens <= self.tpm:
+                return WINDOW_SECONDS - (now - timestamp)
+        return WINDOW_SECONDS - (now - self._entries[-1][0])
+
+    async def wait_if_throttled(self, tokens: int) -> List[float]:
+        """Block until the request fits in the window, then reserve it.
+
+        Returns the window entry so the estimate can be corrected with
+        record_usage once the real token count is known.
+        """
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._evict(now)
+                delay = self._wait_time(now, tokens)
+                if delay <= 0:
+                    break
+                logger.info(f"Rate limit window full, waiting {delay:.1f}s")
+                await asyncio.sleep(delay)
+            entry = [now, float(tokens)]
+            self._entries.append(entry)
+            return entry
+
+    def record_usage(self, entry: List[float], tokens: int) -> None:
+        entry[1] = float(tokens)
+
+
+class AIMDController:
+    """Concurrency limit with additive increase and multiplicative decrease."""
+
+    def __init__(
+        self,
+        c_min: int = 1,
+        c_max: int = 16,
+        alpha: float = 0.5,
+        beta: float = 0.5,
+        initial: Optional[int] = None,
+    ):
+        self.c_min = c_min
+        self.c_max = c_max
+        self.alpha = alpha
+        self.beta = beta
+        self.limit = float(initial if initial is not None else c_max)
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    async def on_success(self) -> None:
+        async with self._condition:
+            self.limit = min(float(self.c_max), self.limit + self.alpha)
+            self._condition.notify_all()
+
+    async def on_error(self) -> None:
+        async with self._condition:
+            self.limit = max(float(self.c_min), self.limit * self.beta)
+            logger.info(f"Backing off: concurrency limit reduced to {int(self.limit)}")